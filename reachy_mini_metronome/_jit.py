@@ -0,0 +1,15 @@
+"""Optional numba JIT support.
+
+Exposes ``njit``: numba's decorator when numba is installed, otherwise a
+no-op so decorated functions run as plain Python.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
@@ -1,14 +1,73 @@
 """Audio generation module for the Reachy Mini Metronome.
 
 Handles synthesized click sound generation and playback.
-Clicks are pre-generated at initialization for low-latency playback.
+Clicks are pre-generated at initialization for low-latency playback
+and cached on disk so later starts skip synthesis. Playback is handed
+to a dedicated pump thread so the beat loop never blocks on the media
+pipeline.
 """
 
+import functools
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+from pathlib import Path
+
 import numpy as np
 import numpy.typing as npt
 
 from reachy_mini import ReachyMini
 
+CLICK_CACHE_DIR = Path.home() / ".cache" / "reachy_metronome"
+
+# Bump whenever generate_click output changes to invalidate on-disk clicks
+_CLICK_CACHE_VERSION = 2
+
+
+def _num_samples(duration_ms: float, sample_rate: int) -> int:
+    return int(sample_rate * duration_ms / 1000)
+
+
+def _generate_clicks_batch(
+    frequencies: tuple[float, ...],
+    durations_ms: tuple[float, ...],
+    amplitudes: tuple[float, ...],
+    sample_rate: int,
+) -> list[npt.NDArray[np.float32]]:
+    """Generate several clicks in one vectorized pass.
+
+    Clicks are synthesized as rows of a zero-padded 2-D array and each
+    returned array is a view of its row trimmed to the true length.
+    """
+    lengths = [_num_samples(d, sample_rate) for d in durations_ms]
+    n_max = max(lengths, default=0)
+    i = np.arange(n_max, dtype=np.float32)[None, :]
+    n = np.asarray(lengths, dtype=np.float32)[:, None]
+
+    # Triangular envelope (10% attack, 90% decay) for clean sound; the
+    # rising and falling ramps cross at the attack peak, so min() picks
+    # the right one without branching
+    attack = np.asarray(
+        [max(1, int(length * 0.1)) for length in lengths], dtype=np.float32
+    )[:, None]
+    inv_attack = np.float32(1.0) / attack
+    inv_decay = np.float32(1.0) / np.maximum(np.float32(1.0), n - attack)
+    envelope = np.minimum(i * inv_attack, (n - i) * inv_decay, dtype=np.float32)
+
+    # Single output buffer: phase ramp (sample index times per-sample phase
+    # step), then sine, envelope and amplitude all in place
+    phase_step = (
+        2 * np.pi * np.asarray(frequencies, dtype=np.float32) / sample_rate
+    ).astype(np.float32)[:, None]
+    out = np.multiply(i, phase_step, dtype=np.float32)
+    np.sin(out, out=out)
+    np.multiply(out, envelope, out=out)
+    out *= np.asarray(amplitudes, dtype=np.float32)[:, None]
+
+    return [out[k, :length] for k, length in enumerate(lengths)]
+
 
 def generate_click(
     frequency: float,
@@ -17,22 +76,57 @@ def generate_click(
     sample_rate: int,
 ) -> npt.NDArray[np.float32]:
     """Generate a click sound as np.float32 array."""
-    num_samples = int(sample_rate * duration_ms / 1000)
-    t = np.linspace(0, duration_ms / 1000, num_samples, dtype=np.float32)
-
-    wave = amplitude * np.sin(2 * np.pi * frequency * t).astype(np.float32)
-
-    # Apply envelope (10% attack, 90% decay) for clean sound
-    envelope = np.ones(num_samples, dtype=np.float32)
-    attack_samples = int(num_samples * 0.1)
-    if attack_samples > 0:
-        envelope[:attack_samples] = np.linspace(0, 1, attack_samples, dtype=np.float32)
-    if num_samples - attack_samples > 0:
-        envelope[attack_samples:] = np.linspace(
-            1, 0, num_samples - attack_samples, dtype=np.float32
+    return _generate_clicks_batch(
+        (frequency,), (duration_ms,), (amplitude,), sample_rate
+    )[0]
+
+
+def _save_atomic(path: Path, buf: npt.NDArray[np.float32]) -> None:
+    """Save *buf* to *path* via a temp file, so a partial file is never read."""
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp",
+                                         delete=False) as f:
+            tmp = f.name
+            np.save(f, buf)
+        os.replace(tmp, path)
+    except OSError:
+        # Cache is best-effort
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_or_make(
+    clicks: tuple[tuple[float, float, float], ...],
+    sample_rate: int,
+) -> npt.NDArray[np.float32]:
+    """Return *clicks* ((frequency, duration_ms, amplitude), ...) back to back.
+
+    The concatenated buffer is loaded from the disk cache, or generated in
+    one batch and saved on a miss.
+    """
+    params = (_CLICK_CACHE_VERSION, clicks, sample_rate)
+    key = hashlib.sha256(repr(params).encode()).hexdigest()
+    path = CLICK_CACHE_DIR / f"{key}.npy"
+
+    expected_len = sum(_num_samples(d, sample_rate) for _, d, _ in clicks)
+    try:
+        buf = np.load(path)
+        if buf.shape != (expected_len,) or buf.dtype != np.float32:
+            raise ValueError("click cache entry has the wrong shape")
+    except Exception:
+        # Missing, truncated (EOFError) or otherwise unreadable: regenerate
+        frequencies, durations_ms, amplitudes = zip(*clicks)
+        buf = np.concatenate(
+            _generate_clicks_batch(frequencies, durations_ms, amplitudes, sample_rate)
         )
+        _save_atomic(path, buf)
 
-    return wave * envelope
+    # Shared between instances via lru_cache, so keep it immutable
+    buf.flags.writeable = False
+    return buf
 
 
 class MetronomeAudio:
@@ -46,32 +140,64 @@ class MetronomeAudio:
     ACCENT_DURATION = 40
     ACCENT_AMPLITUDE = 0.8
 
+    # Sample format consumed by media.push_audio_sample; clicks are stored
+    # in it up front so pushes never convert
+    OUTPUT_DTYPE = np.float32
+
     def __init__(self, sample_rate: int):
         self.sample_rate = sample_rate
         self._playing_started = False
 
-        self.normal_click = generate_click(
-            self.NORMAL_FREQUENCY,
-            self.NORMAL_DURATION,
-            self.NORMAL_AMPLITUDE,
-            sample_rate,
-        )
-        self.accent_click = generate_click(
-            self.ACCENT_FREQUENCY,
-            self.ACCENT_DURATION,
-            self.ACCENT_AMPLITUDE,
-            sample_rate,
+        # Clicks queued by the beat loop, drained by the pump thread;
+        # None tells the pump to exit
+        self._queue: queue.SimpleQueue[npt.NDArray[np.float32] | None] = queue.SimpleQueue()
+        self._pump_thread: threading.Thread | None = None
+
+        # Both clicks live in one contiguous buffer; the attributes are
+        # views into it
+        self._buf = np.ascontiguousarray(
+            _load_or_make(
+                (
+                    (self.ACCENT_FREQUENCY, self.ACCENT_DURATION, self.ACCENT_AMPLITUDE),
+                    (self.NORMAL_FREQUENCY, self.NORMAL_DURATION, self.NORMAL_AMPLITUDE),
+                ),
+                sample_rate,
+            ),
+            dtype=self.OUTPUT_DTYPE,
         )
+        accent_len = _num_samples(self.ACCENT_DURATION, sample_rate)
+        self.accent_click = self._buf[:accent_len]
+        self.normal_click = self._buf[accent_len:]
 
     def play_click(self, is_downbeat: bool, reachy_mini: ReachyMini) -> None:
+        """Push the pre-rendered click for this beat to the media pipeline."""
         if not self._playing_started:
             reachy_mini.media.start_playing()
             self._playing_started = True
+            self._pump_thread = threading.Thread(
+                target=self._audio_pump, args=(reachy_mini,), daemon=True
+            )
+            self._pump_thread.start()
 
         click = self.accent_click if is_downbeat else self.normal_click
-        reachy_mini.media.push_audio_sample(click)
+        self._queue.put_nowait(click)
 
     def stop(self, reachy_mini: ReachyMini) -> None:
         if self._playing_started:
+            self._queue.put_nowait(None)
+            if self._pump_thread is not None:
+                self._pump_thread.join(timeout=1.0)
+                self._pump_thread = None
             reachy_mini.media.stop_playing()
             self._playing_started = False
+
+    def _audio_pump(self, reachy_mini: ReachyMini) -> None:
+        """Push queued clicks to the media pipeline in a background thread."""
+        while True:
+            click = self._queue.get()
+            if click is None:
+                break
+            try:
+                reachy_mini.media.push_audio_sample(click)
+            except Exception:
+                pass  # Drop the click rather than kill the pump
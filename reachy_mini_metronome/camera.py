@@ -0,0 +1,166 @@
+"""Shared camera reader.
+
+A single background thread pulls frames from Reachy Mini's camera and
+publishes the newest one through a triple buffer, so the hand tracker
+and the practice recorder read frames without contending on a lock.
+Consumers that need every frame (the recorder) can also subscribe to a
+bounded queue that the camera thread pushes into. The thread only runs
+while at least one consumer has called start() without a matching stop().
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+from reachy_mini import ReachyMini
+
+
+class CameraReader:
+    """Grabs camera frames in the background and exposes the latest one."""
+
+    CAPTURE_FPS = 24  # covers the recorder (24 FPS) and the tracker (20 FPS)
+    NUM_BUFFERS = 3
+
+    def __init__(self, reachy_mini: ReachyMini):
+        self._reachy = reachy_mini
+
+        # Triple buffer: the camera thread fills _write_idx, then publishes
+        # it by swapping _latest; readers only ever look at _latest
+        self._buffers: list[np.ndarray | None] = [None] * self.NUM_BUFFERS
+        self._write_idx = 0
+        self._latest = -1
+        self._frame_id = 0
+        self._has_frame = threading.Event()
+
+        # Subscriber queues; replaced (never mutated) so the camera thread
+        # can iterate without a lock
+        self._subscribers: tuple[queue.Queue, ...] = ()
+
+        self._users = 0  # consumers between start() and stop()
+        self._thread: threading.Thread | None = None
+        self._thread_stop = threading.Event()
+        self._start_lock = threading.Lock()
+        # Serializes publishing against _halt()'s reset (readers never take it)
+        self._publish_lock = threading.Lock()
+
+    # ── public API ──
+
+    @property
+    def frame_id(self) -> int:
+        """Counter bumped on every published frame (0 before the first)."""
+        return self._frame_id
+
+    def start(self) -> None:
+        """Register a consumer, starting the camera thread for the first one."""
+        with self._start_lock:
+            self._users += 1
+            if self._thread is not None:
+                return
+            # Each thread gets its own stop event, so one that outlives
+            # close()'s join can never keep running alongside its successor
+            self._thread_stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._camera_loop, args=(self._thread_stop,), daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Unregister a consumer, stopping the camera thread after the last one."""
+        with self._start_lock:
+            if self._users == 0:
+                return
+            self._users -= 1
+            if self._users == 0:
+                self._halt()
+
+    def close(self) -> None:
+        """Stop the camera thread regardless of registered consumers."""
+        with self._start_lock:
+            self._users = 0
+            self._halt()
+
+    def latest(self) -> np.ndarray | None:
+        """Return the most recently published frame, or None if none yet."""
+        idx = self._latest
+        if idx < 0:
+            return None
+        return self._buffers[idx]
+
+    def subscribe(self, maxsize: int = 8) -> queue.Queue:
+        """Return a bounded queue receiving every new frame (oldest dropped when full)."""
+        q: queue.Queue = queue.Queue(maxsize=maxsize)
+        with self._start_lock:
+            self._subscribers = (*self._subscribers, q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._start_lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not q)
+
+    def wait_for_frame(self, timeout: float) -> np.ndarray | None:
+        """Block until a first frame is available (up to *timeout* seconds)."""
+        self._has_frame.wait(timeout)
+        return self.latest()
+
+    # ── private ──
+
+    def _halt(self) -> None:
+        # Caller holds _start_lock
+        self._thread_stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        # Forget the last frame so the next start never serves a stale one.
+        # A thread that outlived the join checks its stop event under the
+        # same lock before publishing, so it can't repopulate these.
+        with self._publish_lock:
+            self._has_frame.clear()
+            self._latest = -1
+            self._buffers = [None] * self.NUM_BUFFERS
+
+    @staticmethod
+    def _push(q: queue.Queue, frame: np.ndarray) -> None:
+        try:
+            q.put_nowait(frame)
+        except queue.Full:
+            # Drop the oldest frame so a slow consumer can't grow the queue
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                q.put_nowait(frame)
+            except queue.Full:
+                pass
+
+    def _camera_loop(self, stop: threading.Event) -> None:
+        interval = 1.0 / self.CAPTURE_FPS
+
+        while not stop.is_set():
+            t0 = time.perf_counter()
+
+            try:
+                frame = self._reachy.media.get_frame()
+            except Exception:
+                frame = None  # Skip frame on camera error
+
+            if frame is not None:
+                with self._publish_lock:
+                    if stop.is_set():
+                        break  # Halted while get_frame() blocked: drop it
+                    idx = self._write_idx
+                    self._buffers[idx] = frame
+                    self._latest = idx
+                    self._write_idx = (idx + 1) % self.NUM_BUFFERS
+                    self._frame_id += 1
+                    self._has_frame.set()
+                    for q in self._subscribers:
+                        self._push(q, frame)
+
+            dt = interval - (time.perf_counter() - t0)
+            if dt > 0:
+                stop.wait(dt)
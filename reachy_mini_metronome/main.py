@@ -9,8 +9,11 @@ Features:
 - Hand tracking: YOLOv8n-pose wrist detection, robot head follows user's hands
 """
 
+import math
 import threading
 import time
+from collections import deque
+from dataclasses import dataclass
 
 import numpy as np
 from pydantic import BaseModel
@@ -20,7 +23,9 @@ from reachy_mini.utils import create_head_pose
 
 from fastapi.responses import FileResponse
 
+from ._jit import njit
 from .audio import MetronomeAudio
+from .camera import CameraReader
 from .midi import MidiHandler
 from .recorder import PracticeRecorder
 from .tracker import HandTracker
@@ -46,6 +51,60 @@ class MidiAmplitude(BaseModel):
     value: float
 
 
+@njit(cache=True, fastmath=True)
+def _metronome_tick(
+    now: float,
+    start_time: float,
+    bpm: float,
+    time_signature: int,
+    current_beat: int,
+    next_beat_time: float,
+    amplitude_rad: float,
+    sin_lut: np.ndarray,
+) -> tuple[float, bool, int, float]:
+    """Pure beat/antenna step for one loop tick, compiled with numba when available.
+
+    *sin_lut* is a one-cycle sine table whose length is a power of two.
+    Returns (right_antenna_rad, beat_fired, current_beat, next_beat_time).
+    """
+    beat_fired = now >= next_beat_time
+    if beat_fired:
+        current_beat = (current_beat % time_signature) + 1
+        next_beat_time += 60.0 / bpm
+
+    # Antenna motion: one full swing cycle every two beats
+    phase = ((now - start_time) * bpm / 120.0) % 1.0
+    lut_size = sin_lut.shape[0]
+    idx = int(phase * lut_size) & (lut_size - 1)
+    return amplitude_rad * sin_lut[idx], beat_fired, current_beat, next_beat_time
+
+
+@dataclass(slots=True)
+class MetronomeState:
+    """Metronome and practice timer state shared by endpoints and the main loop."""
+
+    bpm: int
+    time_signature: int
+    current_beat: int = 1
+    display_beat: int = 1
+    is_running: bool = False
+
+    # Timing variables
+    start_time: float = 0.0
+    next_beat_time: float = 0.0
+
+    # Practice timer
+    practice_session_start: float = 0.0
+    practice_total_seconds: float = 0.0
+    midi_paused: bool = False  # practice timer paused due to MIDI idle
+    midi_pause_start: float = 0.0  # when current pause began
+    midi_pause_accumulated: float = 0.0  # total paused seconds this session
+
+    # Latest endpoint values, applied once per tick by the main loop
+    pending_bpm: int | None = None
+    pending_time_signature: int | None = None
+
+
 class ReachyMiniMetronome(ReachyMiniApp):
     """Metronome application for Reachy Mini with practice timer and hand tracking."""
 
@@ -59,48 +118,149 @@ class ReachyMiniMetronome(ReachyMiniApp):
     ANTENNA_AMPLITUDE_DEG = 35.0
     LOOP_INTERVAL = 0.01
     TRACK_INTERVAL = 0.05  # 20 FPS for hand tracking
+    SIN_LUT_SIZE = 1024  # antenna sine table entries (power of two)
+    MAX_PRACTICE_SESSIONS = 500  # oldest history entries are dropped past this
+    TARGET_EPSILON_RAD = 1e-3  # skip motor writes below this change (~0.06 deg)
 
     def run(self, reachy_mini: ReachyMini, stop_event: threading.Event) -> None:
         # Initialize audio system
         sample_rate = reachy_mini.media.get_output_audio_samplerate()
         audio = MetronomeAudio(sample_rate)
 
-        # Metronome state
-        bpm = self.DEFAULT_BPM
-        time_signature = self.DEFAULT_TIME_SIGNATURE
-        current_beat = 1
-        display_beat = 1
-        is_running = False
-
-        # Timing variables
-        start_time = 0.0
-        next_beat_time = 0.0
-
-        # Practice timer state
-        practice_session_start = 0.0
-        practice_total_seconds = 0.0
-        practice_sessions: list[dict] = []
+        # Metronome, timing and practice timer state
+        st = MetronomeState(
+            bpm=self.DEFAULT_BPM,
+            time_signature=self.DEFAULT_TIME_SIGNATURE,
+        )
+        practice_sessions: deque[dict] = deque(maxlen=self.MAX_PRACTICE_SESSIONS)
+        pending_lock = threading.Lock()
 
         # Hand tracking state
         tracking_enabled = False
+        tracking_loading = False  # model is being loaded/exported
+        tracking_smoothing = 0.35
         tracker: HandTracker | None = None
-        last_track_time = 0.0
+        # Set by /tracking/start, cleared by the thread itself as it exits
+        # (under tracking_lock), so at most one tracking thread ever runs
+        tracking_thread: threading.Thread | None = None
+        tracking_lock = threading.Lock()
 
         # MIDI state
         midi_enabled = False
         midi_handler = MidiHandler()
         MIDI_IDLE_TIMEOUT = 2.0  # seconds before pausing practice timer
-        midi_paused = False  # practice timer paused due to MIDI idle
-        midi_pause_start = 0.0  # when current pause began
-        midi_pause_accumulated = 0.0  # total paused seconds this session
 
-        # Shared lock for camera access across threads
-        frame_lock = threading.Lock()
+        # Single camera reader shared by the tracker and the recorder
+        camera = CameraReader(reachy_mini)
 
         # Recorder
-        recorder = PracticeRecorder(frame_lock=frame_lock)
+        recorder = PracticeRecorder(camera=camera)
+
+        amplitude_rad = float(np.deg2rad(self.ANTENNA_AMPLITUDE_DEG))
+
+        def track_loop() -> None:
+            """Tracking thread: load the tracker if needed, then follow hands."""
+            nonlocal tracker, tracking_enabled, tracking_loading, tracking_thread
+            while True:
+                if tracker is None:
+                    # The first load may export the model (minutes for a
+                    # TensorRT engine), so it runs here rather than in the
+                    # request handler
+                    tracking_loading = True
+                    mark_status_dirty()
+                    try:
+                        tracker = HandTracker(smoothing=tracking_smoothing)
+                        tracker.smoothing = tracking_smoothing  # changed while loading
+                    except Exception:
+                        tracking_enabled = False
+                    finally:
+                        tracking_loading = False
+                        mark_status_dirty()
+
+                if tracker is not None and tracking_enabled:
+                    tracker.reset()
+                    # Hold the shared camera only while following hands
+                    camera.start()
+                    try:
+                        follow_hands(tracker)
+                    finally:
+                        camera.stop()
+                    # An inference that outlived /tracking/stop's join may
+                    # have moved the head after its neutral write; redo it
+                    if not tracking_enabled:
+                        return_to_neutral()
+
+                with tracking_lock:
+                    # Re-enabled while winding down: carry on in this thread
+                    # rather than let /tracking/start spawn a second one
+                    if not tracking_enabled or stop_event.is_set():
+                        tracking_thread = None
+                        return
+
+        def return_to_neutral() -> None:
+            """Return head and body to neutral."""
+            head_pose = create_head_pose(yaw=0, pitch=0, degrees=True)
+            reachy_mini.set_target(head=head_pose)
+            reachy_mini.set_target(body_yaw=0.0)
 
-        amplitude_rad = np.deg2rad(self.ANTENNA_AMPLITUDE_DEG)
+        def follow_hands(tracker: HandTracker) -> None:
+            """Follow the user's hands at TRACK_INTERVAL, off the beat loop."""
+            last_frame_id = -1
+            while tracking_enabled and not stop_event.is_set():
+                t0 = time.perf_counter()
+                try:
+                    frame_id = camera.frame_id
+                    frame = camera.latest()
+                    if frame is not None and frame_id != last_frame_id:
+                        last_frame_id = frame_id
+                        result = tracker.submit(frame)
+                    else:
+                        # No new frame: run a partial batch that is due
+                        result = tracker.flush()
+                    # Tracking may have been stopped during inference
+                    if result is not None and tracking_enabled:
+                        yaw, pitch, body_yaw_deg = result
+                        head_pose = create_head_pose(
+                            yaw=yaw, pitch=pitch, degrees=True
+                        )
+                        reachy_mini.set_target(head=head_pose)
+                        reachy_mini.set_target(body_yaw=math.radians(body_yaw_deg))
+                except Exception:
+                    pass  # Skip frame on camera error
+
+                dt = self.TRACK_INTERVAL - (time.perf_counter() - t0)
+                # Wake early for a pending batch's deadline
+                deadline = tracker.flush_deadline
+                if deadline is not None:
+                    dt = min(dt, deadline - time.monotonic())
+                if dt > 0:
+                    stop_event.wait(dt)
+
+        # /status cache: fields that only change through endpoints are
+        # rebuilt when status_version moves past the cached version
+        status_version = 0
+        status_cache_version = -1
+        status_cache: dict = {}
+
+        def mark_status_dirty() -> None:
+            nonlocal status_version
+            status_version += 1
+
+        def build_static_status() -> dict:
+            return {
+                "bpm": st.bpm,
+                "time_signature": st.time_signature,
+                "running": st.is_running,
+                "tracking": {
+                    "enabled": tracking_enabled,
+                    "loading": tracking_loading,
+                    "smoothing": tracking_smoothing,
+                },
+                "midi": {
+                    "enabled": midi_enabled,
+                    "port": midi_handler.port_name,
+                },
+            }
 
         # -----------------------------------------------------------
         # Metronome API Endpoints
@@ -108,94 +268,94 @@ class ReachyMiniMetronome(ReachyMiniApp):
 
         @self.settings_app.post("/bpm")
         def set_bpm(data: BpmUpdate) -> dict:
-            nonlocal bpm
             bpm = max(self.MIN_BPM, min(self.MAX_BPM, data.bpm))
+            with pending_lock:
+                st.pending_bpm = bpm
             return {"bpm": bpm}
 
         @self.settings_app.post("/time_signature")
         def set_time_signature(data: TimeSignatureUpdate) -> dict:
-            nonlocal time_signature, current_beat, display_beat
             time_signature = max(2, min(8, data.beats))
-            current_beat = 1
-            display_beat = 1
+            with pending_lock:
+                st.pending_time_signature = time_signature
             return {"time_signature": time_signature}
 
         @self.settings_app.post("/start")
         def start() -> dict:
-            nonlocal is_running, start_time, next_beat_time
-            nonlocal current_beat, display_beat, practice_session_start
-            nonlocal midi_paused, midi_pause_start, midi_pause_accumulated
-            if not is_running:
-                is_running = True
-                start_time = time.perf_counter()
-                next_beat_time = start_time
-                current_beat = 1
-                display_beat = 1
-                practice_session_start = time.time()
-                midi_paused = False
-                midi_pause_start = 0.0
-                midi_pause_accumulated = 0.0
+            if not st.is_running:
+                st.is_running = True
+                st.start_time = time.perf_counter()
+                st.next_beat_time = st.start_time
+                st.current_beat = 1
+                st.display_beat = 1
+                st.practice_session_start = time.time()
+                st.midi_paused = False
+                st.midi_pause_start = 0.0
+                st.midi_pause_accumulated = 0.0
+            mark_status_dirty()
             return {"running": True}
 
         @self.settings_app.post("/stop")
         def stop() -> dict:
-            nonlocal is_running, current_beat, display_beat
-            nonlocal practice_total_seconds, practice_session_start
-            nonlocal midi_paused, midi_pause_start, midi_pause_accumulated
-            if is_running:
+            if st.is_running:
                 # Finalize any ongoing MIDI pause
-                if midi_paused:
-                    midi_pause_accumulated += time.time() - midi_pause_start
-                    midi_paused = False
-                session_duration = time.time() - practice_session_start - midi_pause_accumulated
-                practice_total_seconds += max(0.0, session_duration)
+                if st.midi_paused:
+                    st.midi_pause_accumulated += time.time() - st.midi_pause_start
+                    st.midi_paused = False
+                session_duration = time.time() - st.practice_session_start - st.midi_pause_accumulated
+                st.practice_total_seconds += max(0.0, session_duration)
                 practice_sessions.append({
                     "duration": round(session_duration, 1),
-                    "bpm": bpm,
-                    "time_signature": time_signature,
+                    "bpm": st.bpm,
+                    "time_signature": st.time_signature,
                 })
-            is_running = False
-            current_beat = 1
-            display_beat = 1
+            st.is_running = False
+            st.current_beat = 1
+            st.display_beat = 1
             reachy_mini.set_target(antennas=[0.0, 0.0])
+            mark_status_dirty()
             return {"running": False}
 
         @self.settings_app.get("/status")
         def get_status() -> dict:
+            nonlocal status_cache, status_cache_version
+            if status_cache_version != status_version:
+                # Snapshot the version first so a concurrent change re-dirties
+                version = status_version
+                status_cache = build_static_status()
+                status_cache_version = version
+            cached = status_cache
+
             current_session_seconds = 0.0
-            if is_running:
+            if st.is_running:
                 pause_now = 0.0
-                if midi_paused:
-                    pause_now = time.time() - midi_pause_start
+                if st.midi_paused:
+                    pause_now = time.time() - st.midi_pause_start
                 current_session_seconds = (
-                    time.time() - practice_session_start
-                    - midi_pause_accumulated - pause_now
+                    time.time() - st.practice_session_start
+                    - st.midi_pause_accumulated - pause_now
                 )
                 current_session_seconds = max(0.0, current_session_seconds)
             return {
-                "bpm": bpm,
-                "time_signature": time_signature,
-                "current_beat": display_beat,
-                "running": is_running,
+                **cached,
+                "current_beat": st.display_beat,
                 "practice": {
                     "current_session": round(current_session_seconds, 1),
-                    "total": round(practice_total_seconds + current_session_seconds, 1),
-                    "session_count": len(practice_sessions) + (1 if is_running else 0),
-                    "midi_paused": midi_paused,
+                    "total": round(st.practice_total_seconds + current_session_seconds, 1),
+                    "session_count": len(practice_sessions) + (1 if st.is_running else 0),
+                    "midi_paused": st.midi_paused,
                 },
                 "tracking": {
-                    "enabled": tracking_enabled,
+                    **cached["tracking"],
                     "hands_detected": tracker.hands_detected if tracker else False,
                     "num_wrists": tracker.num_wrists if tracker else 0,
-                    "smoothing": tracker.smoothing if tracker else 0.35,
                 },
                 "recording": {
                     "state": recorder.state,
                     "elapsed": round(recorder.elapsed, 1),
                 },
                 "midi": {
-                    "enabled": midi_enabled,
-                    "port": midi_handler.port_name,
+                    **cached["midi"],
                     "last_note": midi_handler.last_note,
                     "last_note_name": midi_handler.last_note_name,
                     "last_velocity": midi_handler.last_velocity,
@@ -207,22 +367,21 @@ class ReachyMiniMetronome(ReachyMiniApp):
 
         @self.settings_app.post("/practice/reset")
         def reset_practice() -> dict:
-            nonlocal practice_total_seconds, practice_session_start
-            nonlocal midi_paused, midi_pause_start, midi_pause_accumulated
-            practice_total_seconds = 0.0
+            st.practice_total_seconds = 0.0
             practice_sessions.clear()
-            midi_paused = False
-            midi_pause_start = 0.0
-            midi_pause_accumulated = 0.0
-            if is_running:
-                practice_session_start = time.time()
+            st.midi_paused = False
+            st.midi_pause_start = 0.0
+            st.midi_pause_accumulated = 0.0
+            if st.is_running:
+                st.practice_session_start = time.time()
+            mark_status_dirty()
             return {"reset": True}
 
         @self.settings_app.get("/practice/history")
         def get_practice_history() -> dict:
             return {
-                "sessions": practice_sessions,
-                "total": round(practice_total_seconds, 1),
+                "sessions": list(practice_sessions),
+                "total": round(st.practice_total_seconds, 1),
             }
 
         # -----------------------------------------------------------
@@ -231,31 +390,38 @@ class ReachyMiniMetronome(ReachyMiniApp):
 
         @self.settings_app.post("/tracking/start")
         def start_tracking() -> dict:
-            nonlocal tracking_enabled, tracker
-            if tracker is None:
-                tracker = HandTracker()
-            tracker.reset()
-            tracking_enabled = True
+            nonlocal tracking_enabled, tracking_thread
+            with tracking_lock:
+                tracking_enabled = True
+                if tracking_thread is None:
+                    tracking_thread = threading.Thread(target=track_loop, daemon=True)
+                    tracking_thread.start()
+            mark_status_dirty()
             return {"tracking": True}
 
         @self.settings_app.post("/tracking/stop")
         def stop_tracking() -> dict:
             nonlocal tracking_enabled
-            tracking_enabled = False
-            # Return head and body to neutral
-            head_pose = create_head_pose(yaw=0, pitch=0, degrees=True)
-            reachy_mini.set_target(head=head_pose)
-            reachy_mini.set_target(body_yaw=0.0)
+            with tracking_lock:
+                tracking_enabled = False
+                thread = tracking_thread
+            # Give the tracking thread a moment to finish; if it is slow to
+            # exit, it keeps its handle (so no second one starts) and writes
+            # neutral again itself once its last inference returns
+            if thread is not None:
+                thread.join(timeout=1.0)
+            return_to_neutral()
+            mark_status_dirty()
             return {"tracking": False}
 
         @self.settings_app.post("/tracking/smoothing")
         def set_smoothing(data: SmoothingUpdate) -> dict:
-            nonlocal tracker
+            nonlocal tracking_smoothing
             val = max(0.05, min(1.0, data.value))
-            if tracker is None:
-                tracker = HandTracker(smoothing=val)
-            else:
+            tracking_smoothing = val
+            if tracker is not None:
                 tracker.smoothing = val
+            mark_status_dirty()
             return {"smoothing": val}
 
         # -----------------------------------------------------------
@@ -271,6 +437,7 @@ class ReachyMiniMetronome(ReachyMiniApp):
             nonlocal midi_enabled
             ok = midi_handler.open(data.port_name)
             midi_enabled = ok
+            mark_status_dirty()
             return {"enabled": ok, "port": midi_handler.port_name}
 
         @self.settings_app.post("/midi/stop")
@@ -283,6 +450,7 @@ class ReachyMiniMetronome(ReachyMiniApp):
             if not tracking_enabled:
                 head_pose = create_head_pose(yaw=0, pitch=0, degrees=True)
                 reachy_mini.set_target(head=head_pose)
+            mark_status_dirty()
             return {"enabled": False}
 
         @self.settings_app.get("/midi/status")
@@ -338,88 +506,139 @@ class ReachyMiniMetronome(ReachyMiniApp):
         # Main Loop
         # -----------------------------------------------------------
 
+        # One-cycle sine lookup table for the antenna swing (avoids a scalar
+        # np.sin call every tick; 1024 steps is well below actuator resolution)
+        sin_lut = np.sin(
+            2 * np.pi * np.arange(self.SIN_LUT_SIZE, dtype=np.float32) / self.SIN_LUT_SIZE
+        ).astype(np.float32)
+
+        # Local aliases for the hot loop (skip attribute lookups per tick)
+        loop_interval = self.LOOP_INTERVAL
+        perf_counter = time.perf_counter
+        deg2rad = math.radians
+        set_target = reachy_mini.set_target
+        eps_rad = self.TARGET_EPSILON_RAD
+        eps_deg = math.degrees(eps_rad)
+
+        # Last targets written from the loop (None forces the next write)
+        last_right: float | None = None
+        last_midi_body: float | None = None
+        last_midi_head: tuple[float, float] | None = None
+
+        # Compile the numba kernels now (no-op without numba) so the first
+        # /start or MIDI note doesn't stall the loop and then burst catch-up
+        # clicks; argument types match the real calls
+        _metronome_tick(
+            perf_counter(), 0.0, st.bpm, st.time_signature, 1, 0.0, amplitude_rad, sin_lut
+        )
+        midi_handler.warm_up()
+
+        # Deadline-based pacing: sleep only for what is left of each tick
+        next_tick = perf_counter()
+
         while not stop_event.is_set():
-            now = time.perf_counter()
+            now = perf_counter()
+
+            # ── Apply coalesced BPM / time signature changes ──
+            if st.pending_bpm is not None or st.pending_time_signature is not None:
+                with pending_lock:
+                    new_bpm, new_time_signature = st.pending_bpm, st.pending_time_signature
+                    st.pending_bpm = None
+                    st.pending_time_signature = None
+                if new_bpm is not None:
+                    st.bpm = new_bpm
+                if new_time_signature is not None:
+                    st.time_signature = new_time_signature
+                    st.current_beat = 1
+                    st.display_beat = 1
+                mark_status_dirty()
 
             # ── Metronome logic ──
-            if is_running:
-                if now >= next_beat_time:
-                    display_beat = current_beat
-
-                    is_downbeat = current_beat == 1
-                    audio.play_click(is_downbeat, reachy_mini)
-
-                    current_beat = (current_beat % time_signature) + 1
-                    next_beat_time += 60.0 / bpm
-
-                # Antenna motion
-                beats_per_second = bpm / 60.0
-                elapsed = now - start_time
-                phase = (elapsed * beats_per_second / 2) % 1.0
-
-                right_angle = amplitude_rad * np.sin(2 * np.pi * phase)
-                left_angle = -right_angle
-
-                reachy_mini.set_target(antennas=[right_angle, left_angle])
-
-            # ── Hand tracking logic (20 FPS) ──
-            if tracking_enabled and tracker and (now - last_track_time >= self.TRACK_INTERVAL):
-                last_track_time = now
-                try:
-                    with frame_lock:
-                        frame = reachy_mini.media.get_frame()
-                    if frame is not None:
-                        result = tracker.process_frame(frame)
-                        if result is not None:
-                            yaw, pitch, body_yaw_deg = result
-                            head_pose = create_head_pose(
-                                yaw=yaw, pitch=pitch, degrees=True
-                            )
-                            reachy_mini.set_target(head=head_pose)
-                            reachy_mini.set_target(
-                                body_yaw=np.deg2rad(body_yaw_deg)
-                            )
-                except Exception:
-                    pass  # Skip frame on camera error
+            if st.is_running:
+                beat = st.current_beat
+                right_angle, beat_fired, st.current_beat, st.next_beat_time = _metronome_tick(
+                    now,
+                    st.start_time,
+                    st.bpm,
+                    st.time_signature,
+                    beat,
+                    st.next_beat_time,
+                    amplitude_rad,
+                    sin_lut,
+                )
+                right_angle = float(right_angle)
+                if beat_fired:
+                    st.display_beat = beat
+                    audio.play_click(beat == 1, reachy_mini)
+
+                if last_right is None or abs(right_angle - last_right) > eps_rad:
+                    set_target(antennas=[right_angle, -right_angle])
+                    last_right = right_angle
+            else:
+                last_right = None
 
             # ── MIDI idle → pause practice timer ──
-            if midi_enabled and is_running and midi_handler.last_note_time > 0:
+            if midi_enabled and st.is_running and midi_handler.last_note_time > 0:
                 idle = midi_handler.seconds_since_last_note
-                if idle >= MIDI_IDLE_TIMEOUT and not midi_paused:
-                    midi_paused = True
-                    midi_pause_start = time.time()
-                elif idle < MIDI_IDLE_TIMEOUT and midi_paused:
-                    midi_pause_accumulated += time.time() - midi_pause_start
-                    midi_paused = False
+                if idle >= MIDI_IDLE_TIMEOUT and not st.midi_paused:
+                    st.midi_paused = True
+                    st.midi_pause_start = time.time()
+                elif idle < MIDI_IDLE_TIMEOUT and st.midi_paused:
+                    st.midi_pause_accumulated += time.time() - st.midi_pause_start
+                    st.midi_paused = False
 
             # ── MIDI rhythm body/head motion ──
             if midi_enabled and midi_handler.is_open:
-                body_yaw_deg, head_yaw_deg, head_pitch_deg = midi_handler.update(
-                    self.LOOP_INTERVAL
-                )
-                body_yaw_rad = np.deg2rad(body_yaw_deg)
-                reachy_mini.set_target(body_yaw=body_yaw_rad)
+                body_yaw_deg, head_yaw_deg, head_pitch_deg = midi_handler.update(loop_interval)
+                body_yaw_rad = deg2rad(body_yaw_deg)
+                if last_midi_body is None or abs(body_yaw_rad - last_midi_body) > eps_rad:
+                    set_target(body_yaw=body_yaw_rad)
+                    last_midi_body = body_yaw_rad
                 # Head: only if hand tracking is OFF (avoid conflict)
                 if not tracking_enabled:
-                    head_pose = create_head_pose(
-                        yaw=head_yaw_deg, pitch=head_pitch_deg, degrees=True
-                    )
-                    reachy_mini.set_target(head=head_pose)
+                    if (
+                        last_midi_head is None
+                        or abs(head_yaw_deg - last_midi_head[0]) > eps_deg
+                        or abs(head_pitch_deg - last_midi_head[1]) > eps_deg
+                    ):
+                        head_pose = create_head_pose(
+                            yaw=head_yaw_deg, pitch=head_pitch_deg, degrees=True
+                        )
+                        set_target(head=head_pose)
+                        last_midi_head = (head_yaw_deg, head_pitch_deg)
+                else:
+                    last_midi_head = None
+            else:
+                last_midi_body = None
+                last_midi_head = None
 
-            time.sleep(self.LOOP_INTERVAL)
+            next_tick += loop_interval
+            sleep_dt = next_tick - perf_counter()
+            if sleep_dt > 0:
+                time.sleep(sleep_dt)
+            else:
+                # Overran the tick; resync instead of bursting to catch up
+                next_tick = perf_counter()
 
         # Cleanup
+        thread = tracking_thread
+        if thread is not None:
+            thread.join(timeout=1.0)
+
         if midi_enabled:
             midi_handler.close()
 
         if recorder.state == recorder.STATE_RECORDING:
             recorder.stop()
+        recorder.wait_saved(timeout=180)  # don't exit mid-encode/merge
+
+        camera.close()
 
-        if is_running:
-            if midi_paused:
-                midi_pause_accumulated += time.time() - midi_pause_start
-            session_duration = time.time() - practice_session_start - midi_pause_accumulated
-            practice_total_seconds += max(0.0, session_duration)
+        if st.is_running:
+            if st.midi_paused:
+                st.midi_pause_accumulated += time.time() - st.midi_pause_start
+            session_duration = time.time() - st.practice_session_start - st.midi_pause_accumulated
+            st.practice_total_seconds += max(0.0, session_duration)
 
         audio.stop(reachy_mini)
 
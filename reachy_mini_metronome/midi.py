@@ -16,14 +16,59 @@ try:
 except ImportError:
     _MIDO_AVAILABLE = False
 
+from ._jit import njit
+
 
 # MIDI note names for display
 _NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+_NOTE_NAME_TABLE = [f"{_NOTE_NAMES[n % 12]}{(n // 12) - 1}" for n in range(128)]
 
 
 def _note_name(note: int) -> str:
-    octave = (note // 12) - 1
-    return f"{_NOTE_NAMES[note % 12]}{octave}"
+    return _NOTE_NAME_TABLE[note]
+
+
+@njit(cache=True, fastmath=True)
+def _step(
+    body_pos: float,
+    body_target: float,
+    head_pitch_pos: float,
+    head_pitch_impulse: float,
+    decay: float,
+    impulse_decay: float,
+    return_decay: float,
+    spring_dt: float,
+    head_yaw_ratio: float,
+) -> tuple[float, float, float, float, float]:
+    """Pure spring-damper step, compiled with numba when available.
+
+    The decay arguments are per-step factors (``exp(-rate * dt)``) and
+    *spring_dt* is ``spring * dt``, all precomputed by the caller.
+
+    Returns (body_pos, body_target, head_pitch_pos, head_pitch_impulse, head_yaw_pos).
+    """
+    # Body sway: spring toward target, then target decays to 0
+    body_pos += (body_target - body_pos) * spring_dt
+    body_target *= decay
+
+    # Also let body_pos itself decay (prevents accumulation)
+    body_pos *= decay
+
+    # Head yaw follows body sway
+    head_yaw_pos = body_pos * head_yaw_ratio
+
+    # Head pitch nod: rapid attack, then decay
+    if head_pitch_impulse > 0:
+        # Quick down-press
+        head_pitch_pos += (head_pitch_impulse - head_pitch_pos) * spring_dt * 2.0
+        head_pitch_impulse *= impulse_decay
+        if head_pitch_impulse < 0.3:
+            head_pitch_impulse = 0.0
+    else:
+        # Elastic return to neutral
+        head_pitch_pos *= return_decay
+
+    return body_pos, body_target, head_pitch_pos, head_pitch_impulse, head_yaw_pos
 
 
 class MidiHandler:
@@ -32,13 +77,15 @@ class MidiHandler:
     MAX_BODY_SWAY_DEG = 20.0
     MAX_NOD_DEG = 12.0
     DECAY_RATE = 4.0  # exponential decay per second
+    IMPULSE_DECAY_RATE = 8.0  # nod impulse decay per second
+    RETURN_DECAY_RATE = 6.0  # head pitch return-to-neutral per second
+    DEFAULT_DT = 0.01  # expected update() step, matches the app main loop
     SPRING_FACTOR = 12.0
     HEAD_YAW_RATIO = 0.3  # head yaw follows body sway at this ratio
 
     def __init__(self) -> None:
         self._port = None
         self._port_name = ""
-        self._thread: threading.Thread | None = None
         self._running = False
         self._lock = threading.Lock()
 
@@ -49,12 +96,17 @@ class MidiHandler:
         self._head_pitch_pos = 0.0  # current head pitch (deg)
         self._head_yaw_pos = 0.0  # current head yaw (deg)
         self._sway_direction = 1  # alternates +1 / -1
+        self._motion_seq = 0  # bumped whenever notes/reset change motion state
 
         # CC modifiers
         self._amplitude_mult = 1.0  # CC#1 (mod wheel) — 0..2
         self._max_sway = self.MAX_BODY_SWAY_DEG  # CC#7
         self._decay_rate = self.DECAY_RATE  # CC#11
 
+        # Per-step decay factors, recomputed only when dt or CC#11 changes
+        self._decay_dt = 0.0
+        self._set_decay_dt(self.DEFAULT_DT)
+
         # Status (read from main thread)
         self._last_note = 0
         self._last_velocity = 0
@@ -132,26 +184,22 @@ class MidiHandler:
             return []
 
     def open(self, port_name: str) -> bool:
-        """Open *port_name* and start the background listener thread."""
+        """Open *port_name*; messages are delivered on the backend's own thread."""
         if not _MIDO_AVAILABLE:
             return False
         self.close()
+        self._running = True
         try:
-            self._port = mido.open_input(port_name)
+            self._port = mido.open_input(port_name, callback=self._on_message)
         except Exception:
+            self._running = False
             return False
         self._port_name = port_name
-        self._running = True
-        self._thread = threading.Thread(target=self._listener, daemon=True)
-        self._thread.start()
         return True
 
     def close(self) -> None:
         """Stop listening and close the port."""
         self._running = False
-        if self._thread is not None:
-            self._thread.join(timeout=1.0)
-            self._thread = None
         if self._port is not None:
             try:
                 self._port.close()
@@ -167,20 +215,18 @@ class MidiHandler:
             self._head_pitch_pos = 0.0
             self._head_yaw_pos = 0.0
             self._sway_direction = 1
+            self._motion_seq += 1
 
-    # ── Background listener ──
+    # ── MIDI input callback ──
 
-    def _listener(self) -> None:
-        """Read MIDI messages in a background thread."""
-        while self._running and self._port is not None:
-            try:
-                for msg in self._port.iter_pending():
-                    if not self._running:
-                        break
-                    self._handle_message(msg)
-            except Exception:
-                pass
-            time.sleep(0.001)  # ~1 ms poll
+    def _on_message(self, msg) -> None:
+        """Handle a message pushed by the mido backend (no polling thread)."""
+        if not self._running:
+            return
+        try:
+            self._handle_message(msg)
+        except Exception:
+            pass
 
     def _handle_message(self, msg) -> None:
         if msg.type == "note_on" and msg.velocity > 0:
@@ -213,6 +259,7 @@ class MidiHandler:
             # Head nod impulse
             nod_deg = vel_norm * self.MAX_NOD_DEG * head_scale * self._amplitude_mult
             self._head_pitch_impulse = nod_deg
+            self._motion_seq += 1
 
             # Status
             self._last_note = note
@@ -229,38 +276,65 @@ class MidiHandler:
             self._max_sway = 5.0 + norm * 35.0
         elif control == 11:  # Expression → decay rate 1..10
             self._decay_rate = 1.0 + norm * 9.0
+            self._decay = math.exp(-self._decay_rate * self._decay_dt)
+
+    def _set_decay_dt(self, dt: float) -> None:
+        self._decay_dt = dt
+        self._decay = math.exp(-self._decay_rate * dt)
+        self._impulse_decay = math.exp(-self.IMPULSE_DECAY_RATE * dt)
+        self._return_decay = math.exp(-self.RETURN_DECAY_RATE * dt)
 
     # ── Physics update (called from main loop) ──
 
+    def warm_up(self) -> None:
+        """Compile the physics kernel now so the first update() doesn't stall."""
+        _step(0.0, 0.0, 0.0, 0.0, self._decay, self._impulse_decay,
+              self._return_decay, self.SPRING_FACTOR * self.DEFAULT_DT,
+              self.HEAD_YAW_RATIO)
+
     def update(self, dt: float) -> tuple[float, float, float]:
         """Advance the spring-damper model by *dt* seconds.
 
         Returns (body_yaw_deg, head_yaw_deg, head_pitch_deg).
         """
+        # Snapshot under the lock, integrate outside it, then write back
+        # briefly so the MIDI callback thread is never blocked on the math
+        with self._lock:
+            if dt != self._decay_dt:
+                self._set_decay_dt(dt)
+            seq = self._motion_seq
+            body_pos = self._body_pos
+            body_target = self._body_target
+            head_pitch_pos = self._head_pitch_pos
+            head_pitch_impulse = self._head_pitch_impulse
+            decay = self._decay
+            impulse_decay = self._impulse_decay
+            return_decay = self._return_decay
+
+        (
+            body_pos,
+            body_target,
+            head_pitch_pos,
+            head_pitch_impulse,
+            head_yaw_pos,
+        ) = _step(
+            body_pos,
+            body_target,
+            head_pitch_pos,
+            head_pitch_impulse,
+            decay,
+            impulse_decay,
+            return_decay,
+            self.SPRING_FACTOR * dt,
+            self.HEAD_YAW_RATIO,
+        )
+
         with self._lock:
-            # Body sway: spring toward target, then target decays to 0
-            spring = self.SPRING_FACTOR
-            self._body_pos += (self._body_target - self._body_pos) * spring * dt
-            decay = math.exp(-self._decay_rate * dt)
-            self._body_target *= decay
-
-            # Also let body_pos itself decay (prevents accumulation)
-            self._body_pos *= decay
-
-            # Head yaw follows body sway
-            self._head_yaw_pos = self._body_pos * self.HEAD_YAW_RATIO
-
-            # Head pitch nod: rapid attack, then decay
-            if self._head_pitch_impulse > 0:
-                # Quick down-press
-                self._head_pitch_pos += (
-                    self._head_pitch_impulse - self._head_pitch_pos
-                ) * spring * 2.0 * dt
-                self._head_pitch_impulse *= math.exp(-8.0 * dt)
-                if self._head_pitch_impulse < 0.3:
-                    self._head_pitch_impulse = 0.0
-            else:
-                # Elastic return to neutral
-                self._head_pitch_pos *= math.exp(-6.0 * dt)
-
-            return (self._body_pos, self._head_yaw_pos, self._head_pitch_pos)
+            # A note or reset landed meanwhile: keep its state, drop this step
+            if seq == self._motion_seq:
+                self._body_pos = body_pos
+                self._body_target = body_target
+                self._head_pitch_pos = head_pitch_pos
+                self._head_pitch_impulse = head_pitch_impulse
+                self._head_yaw_pos = head_yaw_pos
+        return (body_pos, head_yaw_pos, head_pitch_pos)
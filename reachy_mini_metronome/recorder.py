@@ -1,17 +1,19 @@
 """Practice recording module.
 
 Records video from Reachy Mini's camera and audio from the system
-default microphone, then merges them into an MP4 file using ffmpeg.
+default microphone. Raw frames are piped straight into an ffmpeg H.264
+encoder while recording; on stop the audio is muxed in without touching
+the video stream. Without ffmpeg, video falls back to an MJPG AVI.
 """
 
 from __future__ import annotations
 
 import os
+import queue
 import shutil
 import subprocess
 import threading
 import time
-from collections import deque
 from datetime import datetime
 from pathlib import Path
 
@@ -22,24 +24,29 @@ import soundfile as sf
 
 from reachy_mini import ReachyMini
 
+from .camera import CameraReader
+
 RECORDINGS_DIR = Path.home() / "reachy_mini_recordings"
 
 
 class PracticeRecorder:
     """Records camera + microphone to MP4."""
 
-    CAPTURE_FPS = 24
+    CAPTURE_FPS = CameraReader.CAPTURE_FPS  # frames are pushed by the camera
+    AUDIO_BLOCK_SECONDS = 1.0  # size of each preallocated audio buffer
+    ELAPSED_EVERY = 6  # publish elapsed every N frames (~4 Hz at 24 FPS)
+    _MJPG_FOURCC = cv2.VideoWriter_fourcc(*"MJPG")  # fallback writer codec
     STATE_IDLE = "idle"
     STATE_RECORDING = "recording"
     STATE_SAVING = "saving"
 
     def __init__(self, output_dir: str | Path = RECORDINGS_DIR,
-                 frame_lock: threading.Lock | None = None):
+                 camera: CameraReader | None = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Shared lock to protect concurrent get_frame() calls
-        self.frame_lock = frame_lock or threading.Lock()
+        # Shared camera reader (created on first start() if not given)
+        self._camera = camera
 
         self.state = self.STATE_IDLE
         self.elapsed = 0.0
@@ -48,18 +55,32 @@ class PracticeRecorder:
         self._recording = False
         self._thread: threading.Thread | None = None
         self._save_thread: threading.Thread | None = None
-        self._writer: cv2.VideoWriter | None = None
+        self._ffmpeg: subprocess.Popen | None = None  # raw BGR → H.264 encoder
+        self._writer: cv2.VideoWriter | None = None  # MJPG fallback (no ffmpeg)
         self._frame_count = 0
+        self._frame_q: queue.Queue | None = None  # frames pushed by the camera
         self._reachy: ReachyMini | None = None
         self._start_time = 0.0
         self._temp_video = ""
 
-        # Audio via sounddevice (system default mic)
+        # Audio via sounddevice (system default mic). The callback copies
+        # into fixed-size preallocated blocks (single writer, no lock); a
+        # writer thread streams full blocks to the WAV and recycles them
+        # through _audio_pool.
         self._audio_stream: sd.InputStream | None = None
-        self._audio_lock = threading.Lock()
-        self._audio_chunks: deque[np.ndarray] = deque()
+        self._audio_blocks: list[np.ndarray | None] = []
+        self._audio_pool: list[np.ndarray] = []
+        self._audio_block_shape = (0, 0)
+        self._audio_pos = 0  # frames captured across all blocks
+        self._audio_written = 0  # full blocks already written to the WAV
+        self._audio_thread: threading.Thread | None = None
+        self._wav: sf.SoundFile | None = None
+        self._temp_audio: str | None = None
         self._sample_rate = 48000
 
+        # Default mic parameters, probed once (query_devices is slow)
+        self._input_params = self._probe_default_input()
+
         self._cleanup_temp_files()
 
     # ── public API ──
@@ -68,28 +89,62 @@ class PracticeRecorder:
         if self.state != self.STATE_IDLE:
             return False
 
-        with self.frame_lock:
-            frame = reachy_mini.media.get_frame()
+        if self._camera is None:
+            self._camera = CameraReader(reachy_mini)
+        self._camera.start()  # released in stop() or on a failed start
+        frame = self._camera.wait_for_frame(timeout=1.0)
         if frame is None:
+            self._camera.stop()
             return False
 
         self._reachy = reachy_mini
         h, w = frame.shape[:2]
 
-        # Open video writer → temp AVI (MJPG, fast to write)
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self._temp_video = str(self.output_dir / f"_tmp_{ts}.avi")
-        fourcc = cv2.VideoWriter_fourcc(*"MJPG")
-        self._writer = cv2.VideoWriter(self._temp_video, fourcc, self.CAPTURE_FPS, (w, h))
-        self._writer.write(frame)
+        if shutil.which("ffmpeg"):
+            # Encode raw frames straight to H.264 → temp MP4 (no intermediate)
+            self._temp_video = str(self.output_dir / f"_tmp_{ts}.mp4")
+            self._ffmpeg = subprocess.Popen(
+                [
+                    "ffmpeg", "-y",
+                    "-f", "rawvideo", "-pix_fmt", "bgr24",
+                    "-s", f"{w}x{h}", "-r", str(self.CAPTURE_FPS),
+                    "-i", "pipe:0",
+                    "-c:v", "libx264", "-preset", "ultrafast", "-crf", "23",
+                    "-pix_fmt", "yuv420p",
+                    "-movflags", "+faststart",
+                    self._temp_video,
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            # No ffmpeg → temp AVI (MJPG, fast to write)
+            self._temp_video = str(self.output_dir / f"_tmp_{ts}.avi")
+            self._writer = cv2.VideoWriter(self._temp_video, self._MJPG_FOURCC,
+                                           self.CAPTURE_FPS, (w, h))
+        try:
+            self._write_frame(frame)
+        except Exception:
+            # Encoder died on startup (e.g. ffmpeg built without libx264)
+            self._abort_video()
+            self._camera.stop()
+            return False
         self._frame_count = 1
+        self._frame_q = self._camera.subscribe()
 
-        # Start audio capture from system default mic
-        self._audio_chunks.clear()
+        # Start audio capture from system default mic → temp WAV
+        if self._input_params is None:
+            self._input_params = self._probe_default_input()
         try:
-            dev_info = sd.query_devices(sd.default.device[0], "input")
-            self._sample_rate = int(dev_info["default_samplerate"])
-            channels = min(dev_info["max_input_channels"], 2)
+            if self._input_params is None:
+                raise RuntimeError("no default input device")
+            self._sample_rate, channels = self._input_params
+            self._reset_audio_blocks(channels)
+            self._temp_audio = str(self.output_dir / f"_tmp_{ts}.wav")
+            self._wav = sf.SoundFile(self._temp_audio, "w",
+                                     samplerate=self._sample_rate, channels=channels)
             self._audio_stream = sd.InputStream(
                 samplerate=self._sample_rate,
                 channels=channels,
@@ -99,14 +154,19 @@ class PracticeRecorder:
             self._audio_stream.start()
         except Exception:
             self._audio_stream = None
+            self._close_wav()
 
         self._recording = True
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self.elapsed = 0.0
         self.state = self.STATE_RECORDING
 
         self._thread = threading.Thread(target=self._capture_loop, daemon=True)
         self._thread.start()
+        if self._wav is not None:
+            self._audio_thread = threading.Thread(target=self._audio_writer_loop,
+                                                  daemon=True)
+            self._audio_thread.start()
         return True
 
     def stop(self) -> None:
@@ -115,8 +175,19 @@ class PracticeRecorder:
 
         self.state = self.STATE_SAVING
         self._recording = False
+        # Measure before draining anything so encoder/audio shutdown time
+        # doesn't lower the measured frame rate
+        duration = time.monotonic() - self._start_time
         if self._thread:
             self._thread.join(timeout=10)
+        if self._frame_q is not None:
+            self._camera.unsubscribe(self._frame_q)
+            self._frame_q = None
+        self._camera.stop()
+
+        # The encoder is drained in the save thread, not the request handler
+        ffmpeg = self._ffmpeg
+        self._ffmpeg = None
 
         if self._writer:
             self._writer.release()
@@ -131,27 +202,44 @@ class PracticeRecorder:
                 pass
             self._audio_stream = None
 
-        duration = time.time() - self._start_time
+        # Finish the WAV: the writer thread has exited, flush the tail block
+        if self._audio_thread is not None:
+            self._audio_thread.join(timeout=10)
+            self._audio_thread = None
+        temp_audio: str | None = None
+        if self._wav is not None:
+            try:
+                self._flush_audio(final=True)
+                if self._audio_pos > 0:
+                    temp_audio = self._temp_audio
+            except Exception:
+                pass
+            self._close_wav()
+        if temp_audio is None and self._temp_audio and os.path.exists(self._temp_audio):
+            os.remove(self._temp_audio)  # Empty or failed audio capture
+        self._temp_audio = None
+
         actual_fps = self._frame_count / duration if duration > 0 else self.CAPTURE_FPS
 
-        # Snapshot data for background merge
         temp_video = self._temp_video
-        with self._audio_lock:
-            audio_chunks = list(self._audio_chunks)
-            self._audio_chunks.clear()
-        sample_rate = self._sample_rate
-
         self._save_thread = threading.Thread(
             target=self._background_save,
-            args=(temp_video, audio_chunks, sample_rate, actual_fps),
+            args=(ffmpeg, temp_video, temp_audio, actual_fps),
             daemon=True,
         )
         self._save_thread.start()
 
-    def _background_save(self, temp_video: str, audio_chunks: list[np.ndarray],
-                         sample_rate: int, actual_fps: float) -> None:
+    def wait_saved(self, timeout: float | None = None) -> None:
+        """Block until a pending background save has finished."""
+        if self._save_thread is not None:
+            self._save_thread.join(timeout)
+
+    def _background_save(self, ffmpeg: subprocess.Popen | None, temp_video: str,
+                         temp_audio: str | None, actual_fps: float) -> None:
         try:
-            result = self._merge(temp_video, audio_chunks, sample_rate, actual_fps)
+            if ffmpeg is not None:
+                self._finish_encoder(ffmpeg)
+            result = self._merge(temp_video, temp_audio, actual_fps)
             self.last_file = result
         except Exception:
             self.last_file = None
@@ -159,14 +247,19 @@ class PracticeRecorder:
             self.state = self.STATE_IDLE
 
     def list_recordings(self) -> list[dict]:
-        out = []
-        for f in sorted(self.output_dir.iterdir()):
-            if f.name.startswith("practice_") and f.is_file():
-                out.append({
-                    "filename": f.name,
-                    "size_mb": round(f.stat().st_size / (1024 * 1024), 1),
-                })
-        return out
+        # scandir's DirEntry caches the type (and stat on some platforms),
+        # avoiding a Path object and extra syscalls per file
+        with os.scandir(self.output_dir) as it:
+            entries = [e for e in it
+                       if e.name.startswith("practice_") and e.is_file(follow_symlinks=False)]
+        entries.sort(key=lambda e: e.name)
+        return [
+            {
+                "filename": e.name,
+                "size_mb": round(e.stat().st_size / (1024 * 1024), 1),
+            }
+            for e in entries
+        ]
 
     def get_file_path(self, filename: str) -> str | None:
         path = self.output_dir / filename
@@ -183,10 +276,111 @@ class PracticeRecorder:
 
     # ── private ──
 
+    @staticmethod
+    def _finish_encoder(proc: subprocess.Popen, timeout: float = 60) -> None:
+        """Close the encoder's input and wait for it to finalize the file."""
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=timeout)
+        except Exception:
+            proc.kill()
+            proc.wait()
+
+    def _abort_video(self) -> None:
+        """Tear down the video writer and drop its temp file."""
+        if self._ffmpeg is not None:
+            self._ffmpeg.kill()
+            try:
+                self._ffmpeg.stdin.close()
+            except Exception:
+                pass  # Buffered frame can't flush into a dead pipe
+            self._ffmpeg.wait()
+            self._ffmpeg = None
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        if self._temp_video and os.path.exists(self._temp_video):
+            os.remove(self._temp_video)
+
+    @staticmethod
+    def _probe_default_input() -> tuple[int, int] | None:
+        """Return (sample_rate, channels) of the default mic, or None."""
+        try:
+            dev_info = sd.query_devices(sd.default.device[0], "input")
+            return int(dev_info["default_samplerate"]), min(dev_info["max_input_channels"], 2)
+        except Exception:
+            return None
+
+    def _reset_audio_blocks(self, channels: int) -> None:
+        shape = (int(self._sample_rate * self.AUDIO_BLOCK_SECONDS), channels)
+        if shape != self._audio_block_shape:
+            self._audio_pool.clear()  # Pooled blocks no longer fit
+            self._audio_block_shape = shape
+        self._audio_blocks = [self._take_audio_block()]
+        self._audio_pos = 0
+        self._audio_written = 0
+
+    def _flush_audio(self, final: bool = False) -> None:
+        """Write completed blocks to the WAV (and the partial tail if *final*)."""
+        block_frames = self._audio_block_shape[0]
+        pos = self._audio_pos
+        full = pos // block_frames
+        while self._audio_written < full:
+            i = self._audio_written
+            block = self._audio_blocks[i]
+            self._wav.write(block)
+            self._audio_blocks[i] = None
+            self._audio_pool.append(block)
+            self._audio_written += 1
+        if final:
+            tail = pos - full * block_frames
+            if tail:
+                self._wav.write(self._audio_blocks[full][:tail])
+            for block in self._audio_blocks[full:]:
+                if block is not None:
+                    self._audio_pool.append(block)
+            self._audio_blocks = []
+            self._audio_written = 0
+
+    def _close_wav(self) -> None:
+        if self._wav is not None:
+            try:
+                self._wav.close()
+            except Exception:
+                pass
+            self._wav = None
+
+    def _audio_writer_loop(self) -> None:
+        """Stream full audio blocks to disk while recording."""
+        while self._recording:
+            try:
+                self._flush_audio()
+            except Exception:
+                pass
+            time.sleep(self.AUDIO_BLOCK_SECONDS / 4)
+
+    def _take_audio_block(self) -> np.ndarray:
+        if self._audio_pool:
+            return self._audio_pool.pop()
+        return np.empty(self._audio_block_shape, dtype=np.float32)
+
     def _audio_callback(self, indata: np.ndarray, frames: int,
                         time_info: object, status: object) -> None:
-        with self._audio_lock:
-            self._audio_chunks.append(indata.copy())
+        # Realtime thread: copy into preallocated blocks, no per-call
+        # allocation and no lock (a new block is only needed once per second)
+        block_frames = self._audio_block_shape[0]
+        blocks = self._audio_blocks
+        pos = self._audio_pos
+        src = 0
+        while src < frames:
+            block_idx, offset = divmod(pos, block_frames)
+            if block_idx == len(blocks):
+                blocks.append(self._take_audio_block())
+            n = min(frames - src, block_frames - offset)
+            blocks[block_idx][offset:offset + n] = indata[src:src + n]
+            src += n
+            pos += n
+        self._audio_pos = pos
 
     def _cleanup_temp_files(self) -> None:
         """Remove orphaned temp files from a previous crashed session."""
@@ -197,71 +391,79 @@ class PracticeRecorder:
                 except OSError:
                     pass
 
-    def _capture_loop(self) -> None:
-        interval = 1.0 / self.CAPTURE_FPS
+    def _write_frame(self, frame: np.ndarray) -> None:
+        if self._ffmpeg is not None:
+            self._ffmpeg.stdin.write(np.ascontiguousarray(frame).data)
+        elif self._writer is not None:
+            self._writer.write(frame)
 
+    def _capture_loop(self) -> None:
+        """Drain frames pushed by the camera into the video writer.
+
+        Encoding happens here, with no lock held, so a slow write never
+        stalls the camera thread or the other frame consumers.
+        """
+        frame_q = self._frame_q
+        start_time = self._start_time
+        every = self.ELAPSED_EVERY
+        n = 0
         while self._recording:
-            t0 = time.time()
-            self.elapsed = t0 - self._start_time
-
             try:
-                with self.frame_lock:
-                    frame = self._reachy.media.get_frame()
-                if frame is not None and self._writer:
-                    self._writer.write(frame)
-                    self._frame_count += 1
+                frame = frame_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Only the status endpoint reads elapsed; no need to update per frame
+            n += 1
+            if n >= every:
+                n = 0
+                self.elapsed = time.monotonic() - start_time
+            try:
+                self._write_frame(frame)
+                self._frame_count += 1
             except Exception:
                 pass
 
-            dt = interval - (time.time() - t0)
-            if dt > 0:
-                time.sleep(dt)
-
-    def _merge(self, temp_video: str, audio_chunks: list[np.ndarray],
-               sample_rate: int, actual_fps: float) -> str | None:
-        ts = os.path.basename(temp_video).replace("_tmp_", "").replace(".avi", "")
-
-        # Write audio WAV
-        temp_audio: str | None = None
-        if audio_chunks:
-            audio_data = np.concatenate(audio_chunks, axis=0)
-            temp_audio = str(self.output_dir / f"_tmp_{ts}.wav")
-            sf.write(temp_audio, audio_data, sample_rate)
+    def _merge(self, temp_video: str, temp_audio: str | None,
+               actual_fps: float) -> str | None:
+        ts, ext = os.path.splitext(os.path.basename(temp_video))
+        ts = ts.replace("_tmp_", "")
 
         output = str(self.output_dir / f"practice_{ts}.mp4")
+        fallback = str(self.output_dir / f"practice_{ts}{ext}")
 
-        if not shutil.which("ffmpeg"):
+        if ext != ".mp4" or not shutil.which("ffmpeg"):
             # No ffmpeg — keep raw AVI
-            fallback = output.replace(".mp4", ".avi")
             os.rename(temp_video, fallback)
             if temp_audio:
                 os.remove(temp_audio)
             return os.path.basename(fallback)
 
+        if not temp_audio and abs(actual_fps - self.CAPTURE_FPS) < 0.05 * self.CAPTURE_FPS:
+            # Nothing to mux and timing is close enough: the encoder already
+            # wrote a faststart MP4, so skip the remux entirely
+            os.rename(temp_video, output)
+            return os.path.basename(output)
+
         try:
-            cmd = ["ffmpeg", "-y", "-r", str(actual_fps), "-i", temp_video]
+            # Video is already H.264: stream-copy it, rescaling timestamps to
+            # the measured capture rate so it stays in sync with the audio
+            cmd = ["ffmpeg", "-y",
+                   "-itsscale", str(self.CAPTURE_FPS / actual_fps), "-i", temp_video]
             if temp_audio:
-                cmd += ["-i", temp_audio]
-            cmd += [
-                "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-                "-c:a", "aac", "-b:a", "128k",
-                "-shortest",
-                "-movflags", "+faststart",
-                output,
-            ]
-            if not temp_audio:
-                # replace audio flags with -an
-                cmd = ["ffmpeg", "-y", "-r", str(actual_fps), "-i", temp_video,
-                       "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-                       "-an", "-movflags", "+faststart", output]
-
-            subprocess.run(cmd, capture_output=True, timeout=120, check=True)
+                cmd += ["-i", temp_audio,
+                        "-c:v", "copy", "-c:a", "aac", "-b:a", "128k", "-shortest"]
+            else:
+                cmd += ["-c:v", "copy", "-an"]
+            cmd += ["-movflags", "+faststart", output]
+
+            subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=120, check=True)
             os.remove(temp_video)
             if temp_audio:
                 os.remove(temp_audio)
             return os.path.basename(output)
         except Exception:
-            fallback = output.replace(".mp4", ".avi")
             if os.path.exists(temp_video):
                 os.rename(temp_video, fallback)
             if temp_audio and os.path.exists(temp_audio):
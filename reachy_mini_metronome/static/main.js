@@ -41,6 +41,7 @@ const midiAmpValue = document.getElementById('midi-amp-value');
 // State
 let isRunning = false;
 let isTracking = false;
+let trackingLoading = false;
 let isRecording = false;
 let isMidiConnected = false;
 let recState = 'idle';
@@ -341,8 +342,9 @@ async function getStatus() {
             const prev = _prevTracking;
             const cur = d.tracking;
 
-            if (!prev || prev.enabled !== cur.enabled) {
+            if (!prev || prev.enabled !== cur.enabled || prev.loading !== cur.loading) {
                 isTracking = cur.enabled;
+                trackingLoading = cur.loading;
                 updateTrackingUI();
             }
 
@@ -450,7 +452,7 @@ function updateTrackingUI() {
     if (isTracking) {
         trackingToggleBtn.classList.add('active');
         trackingToggleBtn.querySelector('.tracking-btn-text').textContent = 'Disable Tracking';
-        trackingStatus.textContent = 'ON';
+        trackingStatus.textContent = trackingLoading ? 'LOADING' : 'ON';
         trackingStatus.className = 'tracking-status on';
     } else {
         trackingToggleBtn.classList.remove('active');
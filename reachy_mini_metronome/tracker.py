@@ -4,9 +4,149 @@ Detects wrist keypoints from camera frames and converts them
 to head yaw/pitch angles for Reachy Mini to follow the user's hands.
 """
 
+import time
+from collections import deque
+from collections.abc import Sequence
+from pathlib import Path
+
+import cv2
 import numpy as np
 from ultralytics import YOLO
 
+MODEL_WEIGHTS = "yolov8n-pose.pt"
+INPUT_SIZE = 320  # frames are resized to INPUT_SIZE x INPUT_SIZE before inference
+
+
+def _cuda_available() -> bool:
+    try:
+        import torch
+
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+def _to_blob(frame: np.ndarray, imgsz: int) -> np.ndarray:
+    """Preprocess a BGR frame the way Ultralytics feeds its ONNX models."""
+    img = cv2.resize(frame, (imgsz, imgsz), interpolation=cv2.INTER_LINEAR)
+    blob = img[..., ::-1].transpose(2, 0, 1)[None].astype(np.float32)
+    blob /= 255.0
+    return blob
+
+
+def _time_onnx(path: Path, blobs: list[np.ndarray]) -> float:
+    """Seconds taken by one CPU pass of an ONNX model over *blobs*."""
+    import onnxruntime as ort
+
+    sess = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+    name = sess.get_inputs()[0].name
+    sess.run(None, {name: blobs[0]})  # warm-up
+    t0 = time.perf_counter()
+    for blob in blobs:
+        sess.run(None, {name: blob})
+    return time.perf_counter() - t0
+
+
+def quantize_pose_model(frames: Sequence[np.ndarray], weights: str = MODEL_WEIGHTS,
+                        imgsz: int = INPUT_SIZE) -> Path | None:
+    """Build an INT8 ONNX copy of the pose model, calibrated on *frames*.
+
+    One-time setup step; *frames* should be ~100 BGR camera frames of the
+    usual practice scene. Static QDQ quantization lets ONNX Runtime run
+    int8 convolutions (VNNI / SDOT where the CPU has them). The copy is
+    kept only if it beats the FP32 model on *frames*, in which case
+    _load_pose_model prefers it from then on. Returns its path, or None
+    if it wasn't kept.
+    """
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    pt_path = Path(weights)
+    fp32_path = pt_path.with_suffix(".onnx")
+    int8_path = pt_path.with_suffix(".int8.onnx")
+    if not fp32_path.is_file():
+        fp32_path = Path(YOLO(weights).export(format="onnx", imgsz=imgsz, dynamic=True))
+
+    blobs = [_to_blob(f, imgsz) for f in frames]
+    fp32_model = onnx.load(str(fp32_path))
+    input_name = fp32_model.graph.input[0].name
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self) -> None:
+            self._blobs = iter(blobs)
+
+        def get_next(self) -> dict | None:
+            blob = next(self._blobs, None)
+            return None if blob is None else {input_name: blob}
+
+    quantize_static(
+        str(fp32_path), str(int8_path), _Reader(),
+        quant_format=QuantFormat.QDQ, per_channel=True,
+        activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8,
+    )
+
+    # Carry the Ultralytics metadata (task, kpt_shape, ...) over so the
+    # copy loads like the FP32 export
+    model = onnx.load(str(int8_path))
+    onnx.helper.set_model_props(
+        model, {p.key: p.value for p in fp32_model.metadata_props}
+    )
+    onnx.save(model, str(int8_path))
+
+    if _time_onnx(int8_path, blobs) >= _time_onnx(fp32_path, blobs):
+        int8_path.unlink()  # No speedup on this CPU; stay on FP32
+        return None
+    return int8_path
+
+
+def _warmed(model: YOLO, imgsz: int) -> YOLO:
+    """Run one dummy prediction and return *model*.
+
+    Ultralytics only opens ONNX Runtime / TensorRT on the first predict,
+    so this surfaces an unusable export here (where the caller can fall
+    back) and keeps backend start-up off the first tracked frames.
+    """
+    model(np.zeros((imgsz, imgsz, 3), dtype=np.uint8), imgsz=imgsz, verbose=False)
+    return model
+
+
+def _load_pose_model(weights: str = MODEL_WEIGHTS, batch: int = 1,
+                     imgsz: int = INPUT_SIZE) -> YOLO:
+    """Load the fastest available runtime for *weights*.
+
+    Prefers a TensorRT FP16 engine (CUDA), then an INT8 ONNX copy from
+    quantize_pose_model(), then an FP32 ONNX export next to the PyTorch
+    weights, exporting once if none exists yet. Falls back to the PyTorch
+    model if the export toolchain is missing.
+    """
+    pt_path = Path(weights)
+    for exported in (
+        pt_path.with_suffix(".engine"),
+        pt_path.with_suffix(".int8.onnx"),
+        pt_path.with_suffix(".onnx"),
+    ):
+        if exported.is_file():
+            try:
+                return _warmed(YOLO(str(exported), task="pose"), imgsz)
+            except Exception:
+                pass  # Unusable export (e.g. missing runtime); try the next
+
+    model = YOLO(weights)
+    try:
+        if _cuda_available():
+            path = model.export(format="engine", half=True, imgsz=imgsz,
+                                dynamic=True, batch=batch)
+        else:
+            path = model.export(format="onnx", imgsz=imgsz, dynamic=True)
+        return _warmed(YOLO(str(path), task="pose"), imgsz)
+    except Exception:
+        return _warmed(model, imgsz)
+
 
 class HandTracker:
     """Tracks hand (wrist) positions using YOLOv8n-pose."""
@@ -18,8 +158,16 @@ class HandTracker:
     BODY_YAW_MAX_DEG = 30.0  # max body rotation for hand tracking
     BODY_SMOOTHING = 0.10  # heavier smoothing for stable base rotation
 
+    BATCH_SIZE = 2  # frames per model call on CUDA (CPU runs one frame per call)
+    BATCH_TIMEOUT = 0.03  # run a partial batch once its oldest frame is this old (s)
+
+    MOTION_GATE_SIZE = (80, 45)  # (w, h) of the grayscale thumbnail for the gate
+    MOTION_THRESHOLD = 2.0  # mean abs pixel diff below which a frame is "static"
+
     def __init__(self, confidence: float = 0.5, smoothing: float = 0.35):
-        self.model = YOLO("yolov8n-pose.pt")
+        # Batching only pays off on the GPU; on CPU it just adds latency
+        self.batch_size = self.BATCH_SIZE if _cuda_available() else 1
+        self.model = _load_pose_model(batch=self.batch_size)
         self.confidence = confidence
         self.smoothing = smoothing
 
@@ -32,40 +180,161 @@ class HandTracker:
         self.hands_detected = False
         self.num_wrists = 0
 
-    def process_frame(self, frame: np.ndarray) -> tuple[float, float, float] | None:
-        """Run pose detection and return (yaw_deg, pitch_deg, body_yaw_deg) or None."""
-        results = self.model(frame, verbose=False, conf=self.confidence)
+        # Frames waiting for the next batched model call
+        self._pending: deque[np.ndarray] = deque(maxlen=self.batch_size)
+        self._pending_since = 0.0
+
+        # Motion gate: thumbnail of the last frame sent to the model, and its
+        # raw (unsmoothed) angles, which the EMA keeps converging toward
+        # while the scene stays static
+        self._prev_small: np.ndarray | None = None
+        self._last_raw: tuple[float, float, float] | None = None
+
+        # Preallocated resize outputs, refilled every frame instead of
+        # allocating new arrays. The gate thumbnail is double-buffered so
+        # _prev_small stays intact while the next one is written.
+        gate_w, gate_h = self.MOTION_GATE_SIZE
+        self._gate_bgr = np.empty((gate_h, gate_w, 3), dtype=np.uint8)
+        self._gate_gray = (
+            np.empty((gate_h, gate_w), dtype=np.uint8),
+            np.empty((gate_h, gate_w), dtype=np.uint8),
+        )
+        self._gate_idx = 0
+        self._input_bufs = np.empty(
+            (self.batch_size, INPUT_SIZE, INPUT_SIZE, 3), dtype=np.uint8
+        )
 
+    def submit(self, frame: np.ndarray) -> tuple[float, float, float] | None:
+        """Queue *frame* and run detection once a batch is full or stale.
+
+        Returns (yaw_deg, pitch_deg, body_yaw_deg) for the newest frame of a
+        processed batch, or None if no batch ran or no hands were found.
+        """
+        # Skip the model entirely when the scene hasn't changed
+        # Use the returned arrays: cv2 allocates instead of filling dst when
+        # the frame's shape/dtype doesn't match it
+        thumb = cv2.resize(frame, self.MOTION_GATE_SIZE, dst=self._gate_bgr,
+                           interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY,
+                             dst=self._gate_gray[self._gate_idx])
+        if (
+            self._prev_small is not None
+            and float(cv2.absdiff(small, self._prev_small).mean()) < self.MOTION_THRESHOLD
+        ):
+            if self._pending:
+                # The scene settled on a frame still waiting for its batch;
+                # run it now rather than strand it behind static frames
+                return self._run_pending()
+            if self._last_raw is None:
+                return None
+            return self._smooth(*self._last_raw)
+        self._prev_small = small
+        self._gate_idx ^= 1  # next thumbnail goes to the other buffer
+
+        now = time.monotonic()
+        if not self._pending:
+            self._pending_since = now
+        self._pending.append(frame)
         if (
-            not results
-            or results[0].keypoints is None
-            or len(results[0].keypoints.data) == 0
+            len(self._pending) < self.batch_size
+            and now - self._pending_since < self.BATCH_TIMEOUT
         ):
+            return None
+        return self._run_pending()
+
+    @property
+    def flush_deadline(self) -> float | None:
+        """time.monotonic() by which flush() should run, or None if idle."""
+        if not self._pending:
+            return None
+        return self._pending_since + self.BATCH_TIMEOUT
+
+    def flush(self) -> tuple[float, float, float] | None:
+        """Run a partial batch once it is BATCH_TIMEOUT old.
+
+        Call this between frames so a batch never waits on the next frame.
+        Returns a result as submit() does, or None if nothing ran.
+        """
+        if not self._pending or time.monotonic() - self._pending_since < self.BATCH_TIMEOUT:
+            return None
+        return self._run_pending()
+
+    def process_frames(
+        self, frames: list[np.ndarray]
+    ) -> tuple[float, float, float] | None:
+        """Run pose detection on *frames* in one model call.
+
+        Each result is folded into the smoothed angles in order; returns the
+        result for the last frame.
+        """
+        # Downscale up front (wrists at arm's length stay well resolved);
+        # keypoints come back in the small frame's pixel coordinates.
+        # Results are consumed before the next call, so the buffers are reused
+        # (oversized batches from direct callers just allocate).
+        bufs = self._input_bufs if len(frames) <= self.batch_size else [None] * len(frames)
+        small = [
+            cv2.resize(f, (INPUT_SIZE, INPUT_SIZE), dst=buf,
+                       interpolation=cv2.INTER_LINEAR)
+            for f, buf in zip(frames, bufs)
+        ]
+        results = self.model(small, imgsz=INPUT_SIZE, verbose=False, conf=self.confidence)
+        out = None
+        for frame, result in zip(small, results):
+            out = self._apply_result(result, frame)
+        return out
+
+    def process_frame(self, frame: np.ndarray) -> tuple[float, float, float] | None:
+        """Run pose detection and return (yaw_deg, pitch_deg, body_yaw_deg) or None."""
+        return self.process_frames([frame])
+
+    def _run_pending(self) -> tuple[float, float, float] | None:
+        frames = list(self._pending)
+        self._pending.clear()
+        return self.process_frames(frames)
+
+    def _smooth(
+        self, raw_yaw: float, raw_pitch: float, raw_body_yaw: float
+    ) -> tuple[float, float, float]:
+        """Step the exponential moving average toward the raw angles."""
+        # On locals, written back once
+        s = self.smoothing
+        yaw = self._yaw
+        pitch = self._pitch
+        body_yaw = self._body_yaw
+        yaw += s * (raw_yaw - yaw)
+        pitch += s * (raw_pitch - pitch)
+        body_yaw += self.BODY_SMOOTHING * (raw_body_yaw - body_yaw)
+        self._yaw, self._pitch, self._body_yaw = yaw, pitch, body_yaw
+        return (yaw, pitch, body_yaw)
+
+    def _apply_result(
+        self, result, frame: np.ndarray
+    ) -> tuple[float, float, float] | None:
+        if result.keypoints is None or len(result.keypoints.data) == 0:
             self.hands_detected = False
             self.num_wrists = 0
+            self._last_raw = None
             return None
 
         h, w = frame.shape[:2]
 
-        # Collect confident wrist positions across all detected persons
-        wrists: list[tuple[float, float]] = []
-        for person_kpts in results[0].keypoints.data:
-            for idx in (self.LEFT_WRIST, self.RIGHT_WRIST):
-                x, y, conf = person_kpts[idx]
-                if conf > self.confidence:
-                    wrists.append((float(x), float(y)))
+        # Confident wrist positions across all detected persons, in one
+        # device→host copy and a masked reduction
+        kpts = result.keypoints.data.cpu().numpy()  # (persons, 17, 3)
+        wrists = kpts[:, (self.LEFT_WRIST, self.RIGHT_WRIST), :]  # (persons, 2, 3)
+        points = wrists[wrists[..., 2] > self.confidence][:, :2]
 
-        if not wrists:
+        if len(points) == 0:
             self.hands_detected = False
             self.num_wrists = 0
+            self._last_raw = None
             return None
 
         self.hands_detected = True
-        self.num_wrists = len(wrists)
+        self.num_wrists = len(points)
 
         # Average position of visible wrists
-        avg_x = sum(p[0] for p in wrists) / len(wrists)
-        avg_y = sum(p[1] for p in wrists) / len(wrists)
+        avg_x, avg_y = points.mean(axis=0).tolist()
 
         # Normalize to [-1, 1]
         norm_x = (avg_x / w - 0.5) * 2
@@ -80,12 +349,8 @@ class HandTracker:
         # Body yaw: same direction as head yaw, larger range
         raw_body_yaw = -norm_x * self.BODY_YAW_MAX_DEG
 
-        # Exponential moving average
-        self._yaw += self.smoothing * (raw_yaw - self._yaw)
-        self._pitch += self.smoothing * (raw_pitch - self._pitch)
-        self._body_yaw += self.BODY_SMOOTHING * (raw_body_yaw - self._body_yaw)
-
-        return (self._yaw, self._pitch, self._body_yaw)
+        self._last_raw = (raw_yaw, raw_pitch, raw_body_yaw)
+        return self._smooth(raw_yaw, raw_pitch, raw_body_yaw)
 
     def reset(self) -> None:
         self._yaw = 0.0
@@ -93,3 +358,6 @@ class HandTracker:
         self._body_yaw = 0.0
         self.hands_detected = False
         self.num_wrists = 0
+        self._pending.clear()
+        self._prev_small = None
+        self._last_raw = None